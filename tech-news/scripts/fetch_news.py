@@ -16,10 +16,14 @@ import json
 import os
 import re
 import urllib.request
+import xml.etree.ElementTree as ET
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin, quote
 from datetime import datetime
 
+from http_client import env_workers, open_stream
+from page_meta import fetch_page_meta, flush as flush_page_meta
+
 # Source registry - 扩展更多源
 SOURCES = {
     # 通用科技
@@ -150,33 +154,57 @@ def list_sources():
     print("Usage: python3 fetch_news.py --source <name> --count 10")
     print("       python3 fetch_news.py --sources hackernews paperswithcode --count 10")
 
+def fetch_description(url, timeout=10):
+    """Fetch og:description (or meta description) from an article page"""
+    try:
+        return fetch_page_meta(url, timeout=timeout)["og_desc"] or ""
+    except Exception:
+        return ""
+
+def fetch_descriptions(urls):
+    """Fetch descriptions for many pages concurrently (network-bound)"""
+    if not urls:
+        return []
+    
+    try:
+        with ThreadPoolExecutor(max_workers=env_workers("DESC_WORKERS", 10, len(urls))) as executor:
+            return list(executor.map(fetch_description, urls))
+    finally:
+        flush_page_meta()
+
 def fetch_hackernews(count=20, min_points=50):
     """Fetch top stories from Hacker News via RSS"""
     url = f"https://hnrss.org/frontpage?points={min_points}&count={count}"
-    req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        xml = resp.read().decode("utf-8")
     
     items = []
-    item_pattern = re.compile(r'<item>(.*?)</item>', re.DOTALL)
-    
-    for item_match in item_pattern.findall(xml):
-        title = re.search(r'<title>(.*?)</title>', item_match)
-        link = re.search(r'<link>(.*?)</link>', item_match)
-        comments = re.search(r'<comments>(.*?)</comments>', item_match)
-        pub_date = re.search(r'<pubDate>(.*?)</pubDate>', item_match)
-        
-        if title and link:
-            title_text = title.group(1).replace('<![CDATA[', '').replace(']]>', '').strip()
-            items.append({
-                "title": title_text,
-                "link": link.group(1).strip(),
-                "comments": comments.group(1).strip() if comments else None,
-                "pub_date": pub_date.group(1).strip() if pub_date else None,
-                "source": "hackernews",
-                "source_name": "Hacker News"
-            })
+    # Parse items straight off the socket; each <item> is cleared once read
+    with open_stream(url, timeout=30) as stream:
+        for _, elem in ET.iterparse(stream, events=("end",)):
+            if elem.tag != "item":
+                continue
+            
+            title = (elem.findtext("title") or "").strip()
+            link = (elem.findtext("link") or "").strip()
+            
+            if title and link:
+                items.append({
+                    "title": title,
+                    "link": link,
+                    "comments": (elem.findtext("comments") or "").strip() or None,
+                    "pub_date": (elem.findtext("pubDate") or "").strip() or None,
+                    "source": "hackernews",
+                    "source_name": "Hacker News"
+                })
+            elem.clear()
+            if len(items) >= count:
+                break
+    
+    # Article pages are only fetched on request (HN_DESCRIPTIONS=1); the feed
+    # itself carries no description, and each page costs a round trip
+    if os.environ.get("HN_DESCRIPTIONS", "0") == "1":
+        descriptions = fetch_descriptions([item["link"] for item in items])
+        for item, description in zip(items, descriptions):
+            item["description"] = description
     
     return items
 
@@ -530,13 +558,7 @@ def fetch_multi_source(sources, count_per_source=10):
     results = {}
     errors = {}
 
-    try:
-        max_workers = int(os.environ.get("FETCH_WORKERS", "4"))
-    except ValueError:
-        max_workers = 4
-    max_workers = max(1, min(max_workers, len(sources)))
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with ThreadPoolExecutor(max_workers=env_workers("FETCH_WORKERS", 4, len(sources))) as executor:
         future_map = {
             executor.submit(fetch_news, source, count=count_per_source): source
             for source in sources
@@ -560,19 +582,26 @@ def fetch_multi_source(sources, count_per_source=10):
 
     return all_articles
 
+# Category keywords, matched as substrings of the lowercased title + description
+CATEGORY_KEYWORDS = {
+    "AI 与机器学习": ["ai", "llm", "model", "agent", "gpt", "claude", "grok", "ml ", "neural", "deep learning", "transformer", "embedding", "fine-tune", "pytorch", "tensorflow", "huggingface", "paper", "arxiv"],
+    "游戏与怀旧科技": ["game", "gaming", "retro", "vintage", "nostalgia", "classic", "emulator", "amiga", "commodore", "atari", "sega", "nintendo"],
+    "开发工具与开源": ["rust", "python", "javascript", "typescript", "github", "open source", "framework", "library", "tool", "compiler", "database", "sql", "docker", "kubernetes", "git", "vscode"],
+    "基础设施与行业": ["cloud", "aws", "gcp", "azure", "server", "datacenter", "infrastructure", "devops", "security", "privacy", "encryption", "blockchain", "crypto"],
+}
+
+# One precompiled alternation per category: a single scan instead of one `in` per keyword
+CATEGORY_PATTERNS = [
+    (category, re.compile("|".join(map(re.escape, keywords))))
+    for category, keywords in CATEGORY_KEYWORDS.items()
+]
+
 def categorize_article(title, description=""):
     """Categorize article by title/description keywords"""
     text = (title + " " + description).lower()
     
-    categories = {
-        "AI 与机器学习": ["ai", "llm", "model", "agent", "gpt", "claude", "grok", "ml ", "neural", "deep learning", "transformer", "embedding", "fine-tune", "pytorch", "tensorflow", "huggingface", "paper", "arxiv"],
-        "游戏与怀旧科技": ["game", "gaming", "retro", "vintage", "nostalgia", "classic", "emulator", "amiga", "commodore", "atari", "sega", "nintendo"],
-        "开发工具与开源": ["rust", "python", "javascript", "typescript", "github", "open source", "framework", "library", "tool", "compiler", "database", "sql", "docker", "kubernetes", "git", "vscode"],
-        "基础设施与行业": ["cloud", "aws", "gcp", "azure", "server", "datacenter", "infrastructure", "devops", "security", "privacy", "encryption", "blockchain", "crypto"],
-    }
-    
-    for category, keywords in categories.items():
-        if any(kw in text for kw in keywords):
+    for category, pattern in CATEGORY_PATTERNS:
+        if pattern.search(text):
             return category
     
     return "趣闻"
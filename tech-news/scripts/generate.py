@@ -20,20 +20,36 @@ import argparse
 import json
 import os
 import re
+import sqlite3
 import subprocess
 import sys
-import urllib.request
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from urllib.parse import urljoin
 
 # 配置
 SCRIPT_DIR = Path(__file__).parent.resolve()
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from http_client import env_workers
+from llm_translate import TranslationError, clip_description, translate_many, translate_title_and_summary
+from page_meta import fetch_page_meta, flush as flush_page_meta
+
+# 启动时检查一次翻译API密钥
+HAS_LLM_KEY = bool(
+    os.environ.get('MINIMAX_API_KEY', '').strip()
+    or os.environ.get('OPENAI_API_KEY', '').strip()
+)
+
 CACHE_DIR = SCRIPT_DIR.parent / "cache"
 CACHE_DIR.mkdir(exist_ok=True)
 
 FETCH_NEWS = SCRIPT_DIR / "fetch_news.py"
+TRANSLATION_DB = CACHE_DIR / "translations.db"
+SEEN_LINKS_PATH = CACHE_DIR / "seen_links.json"
+LEGACY_HISTORY_PATH = CACHE_DIR / "selected_articles.json"
 
 # 分类配置
 CATEGORIES = {
@@ -44,6 +60,26 @@ CATEGORIES = {
     "趣闻与观点": [],  # 默认分类
 }
 
+# 每个分类的篇数上限：精选时超额文章让位给其他分类的候选，候选不足时仍用超额文章补足 limit 篇
+CATEGORY_CAPS = {
+    "AI 与机器学习": 4,
+    "开发工具与开源": 4,
+    "基础设施与云原生": 3,
+    "产品与设计": 2,
+    "趣闻与观点": 2,
+}
+
+# 每个分类预编译为一个交替正则（子串匹配，与逐关键词 in 判断等价），标题只需扫描一次
+CATEGORY_PATTERNS = [
+    (category, re.compile("|".join(map(re.escape, keywords))))
+    for category, keywords in CATEGORIES.items()
+    if keywords
+]
+
+# Markdown 固定片段
+MD_DIVIDER = ("---", "")
+MD_OVERVIEW_HEADER = ("## 📋 文章速览", "")
+
 DEFAULT_SOURCES = [
     "hackernews",
     "reddit-programming",
@@ -67,168 +103,288 @@ def fetch_multi_sources(sources, count=15):
 def categorize(title):
     """根据标题关键词分类。"""
     t = title.lower()
-    for category, keywords in CATEGORIES.items():
-        if any(k in t for k in keywords):
+    for category, pattern in CATEGORY_PATTERNS:
+        if pattern.search(t):
             return category
     return "趣闻与观点"
 
 
+def _is_cjk(text):
+    """文本中汉字占比超过 30% 即视为中文。"""
+    if not text:
+        return False
+    return sum(1 for c in text if '\u4e00' <= c <= '\u9fff') / len(text) > 0.3
+
+
+def _chinese_passthrough(title, description, source_name=None):
+    """标题（及描述）已是中文时直接返回，无需调用LLM；否则返回 None。"""
+    if _is_cjk(title) and (not description or _is_cjk(description)):
+        # 与LLM路径一致，截断过长的描述
+        return title, clip_description(description) or f"来自 {source_name or '科技社区'} 的热门话题。"
+    return None
+
+
 def translate_with_llm(title, description, source_name=None):
     """使用LLM翻译标题和生成摘要。"""
-    import os
+    passthrough = _chinese_passthrough(title, description, source_name)
+    if passthrough:
+        return passthrough
 
-    try:
-        minimax_key = os.environ.get('MINIMAX_API_KEY', '').strip()
-        openai_key = os.environ.get('OPENAI_API_KEY', '').strip()
-        has_api_key = bool(minimax_key or openai_key)
-
-        if has_api_key:
-            sys.path.insert(0, str(SCRIPT_DIR))
-            from llm_translate import translate_title_and_summary, TranslationError
+    if HAS_LLM_KEY:
+        try:
             return translate_title_and_summary(title, description=description or "", source=source_name)
-    except TranslationError as e:
-        print(f"[翻译警告] {e}", file=sys.stderr)
-    except Exception as e:
-        print(f"[翻译错误] {type(e).__name__}", file=sys.stderr)
+        except TranslationError as e:
+            print(f"[翻译警告] {e}", file=sys.stderr)
+        except Exception as e:
+            print(f"[翻译错误] {type(e).__name__}", file=sys.stderr)
+
+    return _fallback_translation(title, source_name)
 
-    # 回退：简单处理
+
+def _fallback_translation(title, source_name=None):
+    """回退：简单处理。"""
     return title, f"来自 {source_name or '科技社区'} 的热门内容。\n\n要点：\n- 详情见原文\n- 值得关注"
 
-def translate_articles_with_cache(articles, cache):
-    """Translate articles with optional parallelism, honoring cache."""
+
+def translate_many_with_llm(articles, batch_size=8, max_workers=3):
+    """批量并发翻译：每次请求翻译多篇，多个请求同时进行。
+
+    请求失败（限流、超时等）的条目直接使用本地回退，避免放大请求量；
+    只有回复中遗漏的条目才逐篇重试。
+    """
+    results = [
+        _chinese_passthrough(
+            a.get("title", ""),
+            a.get("description"),
+            a.get("source_name", a.get("source")),
+        )
+        for a in articles
+    ]
+    to_translate = [idx for idx, result in enumerate(results) if result is None]
+
+    if HAS_LLM_KEY and to_translate:
+        try:
+            translated = translate_many(
+                [
+                    {
+                        "title": articles[idx].get("title", ""),
+                        "description": articles[idx].get("description") or "",
+                        "source": articles[idx].get("source_name", articles[idx].get("source")),
+                    }
+                    for idx in to_translate
+                ],
+                batch_size=batch_size,
+                max_concurrency=max_workers,
+            )
+            for idx, result in zip(to_translate, translated):
+                results[idx] = result
+        except Exception as e:
+            for idx in to_translate:
+                results[idx] = e
+
+    reported = set()
+    retry = []
+    for idx, result in enumerate(results):
+        if isinstance(result, Exception):
+            if id(result) not in reported:
+                reported.add(id(result))
+                if isinstance(result, TranslationError):
+                    print(f"[翻译警告] {result}", file=sys.stderr)
+                else:
+                    print(f"[翻译错误] {type(result).__name__}", file=sys.stderr)
+            article = articles[idx]
+            results[idx] = _fallback_translation(
+                article.get("title", ""),
+                article.get("source_name", article.get("source")),
+            )
+        elif result is None:
+            retry.append(idx)
+
+    if retry:
+        def _translate_one(idx):
+            article = articles[idx]
+            return translate_with_llm(
+                article.get("title", ""),
+                article.get("description"),
+                article.get("source_name", article.get("source")),
+            )
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(retry)))) as executor:
+            for idx, translation in zip(retry, executor.map(_translate_one, retry)):
+                results[idx] = translation
+
+    return results
+
+
+def translate_articles_with_cache(articles, conn):
+    """Translate cache misses in concurrent batches, honoring the SQLite cache."""
+    keys = [article.get("link") or article.get("title") for article in articles]
+    cached = lookup_translations(conn, keys)
+
     pending = []
-    for idx, article in enumerate(articles):
-        key = article.get("link") or article.get("title")
-        if key in cache:
-            article["zh_title"] = cache[key].get("zh_title")
-            article["zh_summary"] = cache[key].get("zh_summary")
+    for key, article in zip(keys, articles):
+        if key in cached:
+            article["zh_title"], article["zh_summary"] = cached[key]
         else:
-            pending.append((idx, key, article))
+            pending.append((key, article))
 
     if not pending:
         return
 
     try:
-        max_workers = int(os.environ.get("TRANSLATE_WORKERS", "3"))
+        batch_size = max(1, int(os.environ.get("TRANSLATE_BATCH_SIZE", "8")))
     except ValueError:
-        max_workers = 3
-    max_workers = max(1, min(max_workers, len(pending)))
-
-    def _translate_one(item):
-        _, _, article = item
-        return translate_with_llm(
-            article.get("title", ""),
-            article.get("description"),
-            article.get("source_name", article.get("source")),
+        batch_size = 8
+
+    translations = translate_many_with_llm(
+        [article for _, article in pending],
+        batch_size=batch_size,
+        max_workers=env_workers("TRANSLATE_WORKERS", 3, len(pending)),
+    )
+    entries = {}
+    for (key, article), (zh_title, zh_summary) in zip(pending, translations):
+        article["zh_title"] = zh_title
+        article["zh_summary"] = zh_summary
+        entries[key] = (zh_title, zh_summary)
+    save_translation_cache(conn, entries)
+
+
+def open_translation_cache():
+    """打开翻译缓存（SQLite + WAL），首次使用时导入旧的 translations.json。"""
+    conn = sqlite3.connect(TRANSLATION_DB)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS tr (key TEXT PRIMARY KEY, zh_title TEXT, zh_summary TEXT)")
+
+    legacy_path = CACHE_DIR / "translations.json"
+    if legacy_path.exists() and conn.execute("SELECT 1 FROM tr LIMIT 1").fetchone() is None:
+        legacy = json.loads(legacy_path.read_text(encoding="utf-8"))
+        save_translation_cache(conn, {
+            key: (value.get("zh_title"), value.get("zh_summary"))
+            for key, value in legacy.items()
+        })
+
+    return conn
+
+
+def lookup_translations(conn, keys):
+    """按 key 批量查询缓存，返回 {key: (zh_title, zh_summary)}。"""
+    keys = list(dict.fromkeys(k for k in keys if k))
+    found = {}
+    # SQLite 单条语句的参数个数有上限，分块查询
+    for i in range(0, len(keys), 500):
+        chunk = keys[i:i + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"SELECT key, zh_title, zh_summary FROM tr WHERE key IN ({placeholders})", chunk
         )
+        for key, zh_title, zh_summary in rows:
+            found[key] = (zh_title, zh_summary)
+    return found
+
 
-    if max_workers == 1:
-        for item in pending:
-            idx, key, article = item
-            zh_title, zh_summary = _translate_one(item)
-            article["zh_title"] = zh_title
-            article["zh_summary"] = zh_summary
-            cache[key] = {"zh_title": zh_title, "zh_summary": zh_summary}
+def save_translation_cache(conn, entries):
+    """在单个事务中写入新翻译（upsert）。"""
+    if not entries:
         return
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO tr (key, zh_title, zh_summary) VALUES (?, ?, ?)",
+            [(key, zh_title, zh_summary) for key, (zh_title, zh_summary) in entries.items()],
+        )
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_map = {executor.submit(_translate_one, item): item for item in pending}
-        for future in as_completed(future_map):
-            idx, key, article = future_map[future]
-            try:
-                zh_title, zh_summary = future.result()
-            except Exception as e:
-                print(f"[翻译错误] {type(e).__name__}", file=sys.stderr)
-                zh_title, zh_summary = translate_with_llm(
-                    article.get("title", ""),
-                    article.get("description"),
-                    article.get("source_name", article.get("source")),
-                )
-            article["zh_title"] = zh_title
-            article["zh_summary"] = zh_summary
-            cache[key] = {"zh_title": zh_title, "zh_summary": zh_summary}
-
-
-def load_translation_cache():
-    """加载翻译缓存。"""
-    cache_path = CACHE_DIR / "translations.json"
-    if cache_path.exists():
-        return json.loads(cache_path.read_text(encoding="utf-8"))
-    return {}
-
-
-def save_translation_cache(cache):
-    """保存翻译缓存。"""
-    cache_path = CACHE_DIR / "translations.json"
-    cache_path.write_text(json.dumps(cache, ensure_ascii=False, indent=2), encoding="utf-8")
 
+def load_seen_links():
+    """加载已选链接索引 {link: 选中时间ISO}；索引缺失时从旧的 selected_articles.json 重建。"""
+    if SEEN_LINKS_PATH.exists():
+        return json.loads(SEEN_LINKS_PATH.read_text(encoding="utf-8"))
 
-def dedupe_articles(articles, days=3):
-    """基于缓存去重最近N天的文章。"""
-    cache_path = CACHE_DIR / "selected_articles.json"
-    seen_links = set()
+    seen = {}
+    if LEGACY_HISTORY_PATH.exists():
+        for entry in json.loads(LEGACY_HISTORY_PATH.read_text(encoding="utf-8")):
+            link = entry.get("link")
+            if link:
+                seen[link] = max(seen.get(link, ""), entry.get("date", ""))
+    return seen
 
-    if cache_path.exists():
-        history = json.loads(cache_path.read_text(encoding="utf-8"))
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        for entry in history:
-            if entry.get("date", "") > cutoff:
-                seen_links.add(entry.get("link"))
 
-    return [a for a in articles if a.get("link") not in seen_links]
+def dedupe_articles(articles, days=3):
+    """基于已选链接索引去重最近N天的文章。"""
+    seen = load_seen_links()
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+    return [a for a in articles if seen.get(a.get("link"), "") <= cutoff]
 
 
-def pick_articles_balanced(articles, limit=10, per_source=2):
-    """均衡选择文章，确保来源多样性。"""
+def pick_articles_balanced(articles, limit=10, per_source=2, caps=CATEGORY_CAPS):
+    """均衡选择文章，确保来源多样性；分类上限优先让位给其他分类，候选不足时再用超额文章补足 limit 篇。"""
     buckets = {}
     for a in articles:
         buckets.setdefault(a.get('source', 'unknown'), []).append(a)
 
     source_order = list(buckets.keys())
+    cursors = dict.fromkeys(source_order, 0)
+    overflow = {src: [] for src in source_order}
+    counts = {}
     picked = []
 
+    def _take_next(src):
+        """从该源取下一篇未超分类上限的文章（并记录分类供生成Markdown复用）。"""
+        bucket = buckets[src]
+        while cursors[src] < len(bucket):
+            article = bucket[cursors[src]]
+            cursors[src] += 1
+            cat = article.get("category") or categorize(article["title"])
+            article["category"] = cat
+            if counts.get(cat, 0) >= caps.get(cat, limit):
+                overflow[src].append(article)
+                continue
+            counts[cat] = counts.get(cat, 0) + 1
+            picked.append(article)
+            return True
+        return False
+
     # 第一轮：每源最多2条
     for src in source_order:
-        if src in buckets:
-            picked.extend(buckets[src][:per_source])
+        for _ in range(per_source):
+            if len(picked) >= limit or not _take_next(src):
+                break
         if len(picked) >= limit:
-            return picked[:limit]
+            return picked
 
     # 第二轮：轮询补充
-    i = per_source
     while len(picked) < limit:
         progressed = False
         for src in source_order:
-            if src in buckets and i < len(buckets[src]):
-                picked.append(buckets[src][i])
+            if _take_next(src):
+                progressed = True
+                if len(picked) >= limit:
+                    return picked
+        if not progressed:
+            break
+
+    # 第三轮：候选用尽仍不足时，按同样的来源轮询补入超额文章
+    i = 0
+    while len(picked) < limit:
+        progressed = False
+        for src in source_order:
+            if i < len(overflow[src]):
+                picked.append(overflow[src][i])
                 progressed = True
                 if len(picked) >= limit:
-                    return picked[:limit]
+                    return picked
         if not progressed:
             break
         i += 1
 
-    return picked[:limit]
+    return picked
 
 
 def fetch_og_image(url, timeout=5):
     """抓取文章的og:image。"""
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            html = resp.read().decode("utf-8", errors="ignore")
-
-        # 尝试多种og:image格式
-        patterns = [
-            r'<meta[^>]*property=["\']og:image["\'][^>]*content=["\']([^"\']+)["\']',
-            r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*property=["\']og:image["\']',
-            r'<meta[^>]*name=["\']twitter:image["\'][^>]*content=["\']([^"\']+)["\']',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, html, re.I)
-            if match:
-                return urljoin(url, match.group(1))
+        image_url = fetch_page_meta(url, timeout=timeout)["og_image"]
+        if image_url:
+            return urljoin(url, image_url)
     except Exception:
         pass
     return None
@@ -262,35 +418,43 @@ def upload_image_to_r2(image_url, key, timeout=10):
 
 
 def process_articles_images(articles, date_str, max_images=10):
-    """处理文章图片，上传R2并返回URL列表。"""
-    uploaded_urls = []
+    """处理文章图片，上传R2并返回URL列表。
 
-    for i, article in enumerate(articles):
-        if len(uploaded_urls) >= max_images:
-            article.pop("image_url", None)
-            continue
+    与逐篇处理相同：按文章顺序取前 max_images 张上传成功的图片，
+    上传失败时由后续文章补位。每轮只并发处理还缺的张数，不多抓页面。
+    """
+    for article in articles:
+        article.pop("image_url", None)
+    if not articles or max_images <= 0:
+        return []
 
-        # 抓取og:image
+    date_path = date_str.replace('-', '/')
+
+    def _process(item):
+        # 抓取og:image并上传到R2（纯网络等待）
+        i, article = item
         image_url = fetch_og_image(article["link"])
         if not image_url:
-            article.pop("image_url", None)
-            continue
+            return None, None
+        return image_url, upload_image_to_r2(image_url, f"images/{date_path}/article-{i+1:02d}.jpg")
 
-        # 生成R2 key
-        key = f"images/{date_str.replace('-', '/')}/article-{i+1:02d}.jpg"
-
-        # 上传到R2
-        public_url = upload_image_to_r2(image_url, key)
-        if public_url:
-            article["image_url"] = public_url
-            uploaded_urls.append({
-                "article": article.get("zh_title", article["title"])[:30],
-                "r2_url": public_url,
-                "source_image": image_url
-            })
-            print(f"  [图片上传] {public_url}")
-        else:
-            article.pop("image_url", None)
+    uploaded_urls = []
+    pending = list(enumerate(articles))
+    with ThreadPoolExecutor(max_workers=env_workers("IMAGE_WORKERS", 8, min(len(articles), max_images))) as executor:
+        while pending and len(uploaded_urls) < max_images:
+            wave = pending[:max_images - len(uploaded_urls)]
+            pending = pending[len(wave):]
+            for (_, article), (image_url, public_url) in zip(wave, executor.map(_process, wave)):
+                if not public_url:
+                    continue
+                article["image_url"] = public_url
+                uploaded_urls.append({
+                    "article": article.get("zh_title", article["title"])[:30],
+                    "r2_url": public_url,
+                    "source_image": image_url
+                })
+                print(f"  [图片上传] {public_url}")
+    flush_page_meta()
 
     return uploaded_urls
 
@@ -300,35 +464,33 @@ def generate_markdown(date_str, articles):
     lines = []
 
     # 1. 固定标题格式
-    lines.append(f"# 📰 {date_str} 科技早报")
-    lines.append("")
+    lines.extend((f"# 📰 {date_str} 科技早报", ""))
 
-    # 2. 固定摘要格式 - 包含文章数量和来源分布
+    # 单次遍历：同时统计来源分布并按分类分组
     source_counts = {}
-    for a in articles:
-        src = a.get("source_name", a.get("source", "未知"))
+    grouped = {cat: [] for cat in CATEGORIES.keys()}
+    for article in articles:
+        src = article.get("source_name", article.get("source", "未知"))
         source_counts[src] = source_counts.get(src, 0) + 1
 
+        cat = article.get("category") or categorize(article["title"])
+        if cat not in grouped:
+            cat = "趣闻与观点"
+        grouped[cat].append(article)
+
+    # 2. 固定摘要格式 - 包含文章数量和来源分布
     source_summary = " | ".join([f"{src}({count})" for src, count in sorted(source_counts.items())])
 
-    lines.append("> 📊 **今日导读**")
-    lines.append(f"> 精选 {len(articles)} 条科技新闻")
-    lines.append(f"> 来源：{source_summary}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    lines.extend((
+        "> 📊 **今日导读**",
+        f"> 精选 {len(articles)} 条科技新闻",
+        f"> 来源：{source_summary}",
+        "",
+    ))
+    lines.extend(MD_DIVIDER)
 
     # 3. 文章速览 - 固定格式的目录
-    lines.append("## 📋 文章速览")
-    lines.append("")
-
-    # 按分类分组统计
-    grouped = {cat: [] for cat in CATEGORIES.keys()}
-    for article in articles:
-        cat = article.get("category", categorize(article["title"]))
-        if cat not in grouped:
-            cat = "趣闻与观点"
-        grouped[cat].append(article)
+    lines.extend(MD_OVERVIEW_HEADER)
 
     # 生成分类概览
     for category in CATEGORIES.keys():
@@ -343,8 +505,7 @@ def generate_markdown(date_str, articles):
             lines.append(f"{i}. {display_title}")
         lines.append("")
 
-    lines.append("---")
-    lines.append("")
+    lines.extend(MD_DIVIDER)
 
     # 4. 详细内容 - 固定结构
     for category in CATEGORIES.keys():
@@ -352,8 +513,7 @@ def generate_markdown(date_str, articles):
         if not items:
             continue
 
-        lines.append(f"## {category}")
-        lines.append("")
+        lines.extend((f"## {category}", ""))
 
         for idx, item in enumerate(items, 1):
             zh_title = item.get("zh_title", item["title"])
@@ -361,18 +521,14 @@ def generate_markdown(date_str, articles):
             source_name = item.get("source_name", item.get("source", "来源"))
 
             # 固定文章编号格式
-            lines.append(f"### {idx}. {zh_title}")
-            lines.append("")
+            lines.extend((f"### {idx}. {zh_title}", ""))
 
             # 元信息行 - 固定格式
-            meta_info = f"📰 **{source_name}**"
-            lines.append(meta_info)
-            lines.append("")
+            lines.extend((f"📰 **{source_name}**", ""))
 
             # 图片 - 固定位置
             if item.get("image_url"):
-                lines.append(f'<img src="{item["image_url"]}" width="100%" alt="{zh_title[:20]}" style="border-radius:8px;margin:10px 0;">')
-                lines.append("")
+                lines.extend((f'<img src="{item["image_url"]}" width="100%" alt="{zh_title[:20]}" style="border-radius:8px;margin:10px 0;">', ""))
 
             # 摘要内容 - 固定格式处理
             if zh_summary:
@@ -381,8 +537,7 @@ def generate_markdown(date_str, articles):
                 main_summary = summary_parts[0].strip()
 
                 if main_summary:
-                    lines.append("**摘要**：" + main_summary)
-                    lines.append("")
+                    lines.extend(("**摘要**：" + main_summary, ""))
 
                 # 要点处理
                 if len(summary_parts) > 1:
@@ -398,36 +553,28 @@ def generate_markdown(date_str, articles):
                         lines.append("")
 
             # 原文链接 - 固定格式
-            lines.append(f"🔗 [阅读原文]({item['link']})")
-            lines.append("")
-            lines.append("---")
-            lines.append("")
+            lines.extend((f"🔗 [阅读原文]({item['link']})", ""))
+            lines.extend(MD_DIVIDER)
 
-    lines.append(f"*本次汇总于 {datetime.now().strftime('%Y-%m-%d %H:%M')} 生成*")
-    lines.append("")
+    lines.extend((f"*本次汇总于 {datetime.now().strftime('%Y-%m-%d %H:%M')} 生成*", ""))
 
     return "\n".join(lines)
 
 
 def save_selected_history(articles, date_str):
-    """保存已选文章到历史记录（用于去重）。"""
-    cache_path = CACHE_DIR / "selected_articles.json"
-    history = []
-    if cache_path.exists():
-        history = json.loads(cache_path.read_text(encoding="utf-8"))
+    """保存已选文章到链接索引（用于去重）。"""
+    seen = load_seen_links()
 
+    now = datetime.now()
+    selected_at = now.isoformat()
     for a in articles:
-        history.append({
-            "date": datetime.now().isoformat(),
-            "link": a["link"],
-            "title": a.get("zh_title", a["title"]),
-        })
+        seen[a["link"]] = selected_at
 
     # 只保留最近30天
-    cutoff = (datetime.now() - timedelta(days=30)).isoformat()
-    history = [h for h in history if h.get("date", "") > cutoff]
+    cutoff = (now - timedelta(days=30)).isoformat()
+    seen = {link: date for link, date in seen.items() if date > cutoff}
 
-    cache_path.write_text(json.dumps(history, ensure_ascii=False, indent=2), encoding="utf-8")
+    SEEN_LINKS_PATH.write_text(json.dumps(seen, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
 def print_summary(articles, uploaded_images, elapsed_time):
@@ -496,9 +643,11 @@ def main():
 
     # 4. 翻译
     print("[4/5] 翻译标题和生成摘要...")
-    cache = load_translation_cache()
-    translate_articles_with_cache(articles, cache)
-    save_translation_cache(cache)
+    conn = open_translation_cache()
+    try:
+        translate_articles_with_cache(articles, conn)
+    finally:
+        conn.close()
 
     # 5. 图片处理
     uploaded_images = []
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Shared HTTP helpers with connection reuse.
+
+When `requests` is installed, all calls go through one module-level
+Session so repeated hits to the same host (hnrss.org, CDNs, LLM endpoints)
+reuse keep-alive connections instead of paying DNS + TCP + TLS each time.
+Without it, falls back to plain urllib so the skill stays stdlib-only.
+
+When `httpx` with HTTP/2 support is installed, JSON POSTs (the LLM calls)
+go through one HTTP/2 client instead, so concurrent translation requests
+are multiplexed over a single connection with one TLS handshake.
+
+Optional:
+  python3 -m pip install requests
+  python3 -m pip install "httpx[http2]"
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import urllib.request
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Mapping
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:
+    requests = None
+
+try:
+    import h2  # noqa: F401  (required by httpx for http2=True)
+    import httpx
+except ImportError:
+    httpx = None
+
+USER_AGENT = "Mozilla/5.0"
+HEAD_LIMIT = 65536
+
+
+def _build_session():
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def env_workers(name: str, default: int, jobs: int) -> int:
+    """Read a worker-count env var, clamped to [1, jobs]."""
+    try:
+        workers = int(os.environ.get(name, str(default)))
+    except ValueError:
+        workers = default
+    return max(1, min(workers, jobs))
+
+
+SESSION = _build_session() if requests is not None else None
+HTTP2_CLIENT = httpx.Client(http2=True, timeout=90, headers={"User-Agent": USER_AGENT}) if httpx is not None else None
+
+
+def get(url: str, timeout: float = 30, headers: dict | None = None) -> tuple[bytes, Mapping[str, str]]:
+    """GET url and return (body, response headers). Raises on HTTP errors."""
+    if SESSION is not None:
+        resp = SESSION.get(url, timeout=timeout, headers=headers)
+        resp.raise_for_status()
+        return resp.content, resp.headers
+
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, **(headers or {})})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.read(), resp.headers
+
+
+@contextmanager
+def open_stream(url: str, timeout: float = 30) -> Iterator[BinaryIO]:
+    """GET url and yield a file-like body for incremental parsing (e.g. iterparse)."""
+    if SESSION is not None:
+        with SESSION.get(url, timeout=timeout, stream=True) as resp:
+            resp.raise_for_status()
+            resp.raw.decode_content = True  # transparently gunzip
+            yield resp.raw
+        return
+
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        yield resp
+
+
+def _iter_body(url: str, timeout: float, chunk_size: int):
+    """Yield the response body in chunks; closing the generator drops the connection."""
+    if SESSION is not None:
+        with SESSION.get(url, timeout=timeout, stream=True) as resp:
+            resp.raise_for_status()
+            yield from resp.iter_content(chunk_size)
+        return
+
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        while True:
+            chunk = resp.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def get_head(url: str, timeout: float = 30, limit: int = HEAD_LIMIT) -> str:
+    """GET an HTML page but only read up to </head> (at most limit bytes).
+
+    Meta tags live in <head>, so there is no need to download multi-MB
+    bodies full of scripts just to read og:* values.
+    """
+    buf = bytearray()
+    body = _iter_body(url, timeout, 8192)
+    try:
+        for chunk in body:
+            # Re-scan a few bytes back in case </head> straddles two chunks
+            start = max(0, len(buf) - 6)
+            buf += chunk
+            if len(buf) >= limit or b"</head>" in buf[start:].lower():
+                break
+    finally:
+        body.close()
+    return bytes(buf[:limit]).decode("utf-8", errors="ignore")
+
+
+def post_json(url: str, payload: dict, headers: dict, timeout: float = 60) -> dict:
+    """POST a JSON payload and return the decoded JSON response."""
+    if HTTP2_CLIENT is not None:
+        resp = HTTP2_CLIENT.post(url, json=payload, headers=headers, timeout=timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    if SESSION is not None:
+        resp = SESSION.post(url, json=payload, headers=headers, timeout=timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    data = json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read().decode("utf-8"))
+
+
+def _iter_sse(lines) -> Iterator[dict]:
+    for raw in lines:
+        line = raw.decode("utf-8", errors="replace") if isinstance(raw, bytes) else raw
+        line = line.strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        if data:
+            yield json.loads(data)
+
+
+def post_sse(url: str, payload: dict, headers: dict, timeout: float = 60) -> Iterator[dict]:
+    """POST a JSON payload and yield the JSON `data:` events of an SSE reply.
+
+    Closing the generator early closes the connection, which is how callers
+    stop a generation they no longer need.
+    """
+    if HTTP2_CLIENT is not None:
+        with HTTP2_CLIENT.stream("POST", url, json=payload, headers=headers, timeout=timeout) as resp:
+            resp.raise_for_status()
+            yield from _iter_sse(resp.iter_lines())
+        return
+
+    if SESSION is not None:
+        with SESSION.post(url, json=payload, headers=headers, timeout=timeout, stream=True) as resp:
+            resp.raise_for_status()
+            yield from _iter_sse(resp.iter_lines())
+        return
+
+    data = json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        yield from _iter_sse(resp)
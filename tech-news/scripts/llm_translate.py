@@ -12,14 +12,20 @@ Env:
   OPENAI_BASE_URL (optional, default: https://api.openai.com)
   OPENAI_MODEL (optional, default: gpt-4o-mini)
 
+  LLM_STREAM (optional, default: 1) - stream replies and stop reading once
+    all sections are received; set to 0 to use plain requests
+
 Priority: Minimax > OpenAI
 """
 
 from __future__ import annotations
 
-import json
 import os
-import urllib.request
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from http_client import post_json, post_sse
 
 
 class TranslationError(Exception):
@@ -28,32 +34,27 @@ class TranslationError(Exception):
 
 
 def _post_json(url: str, payload: dict, headers: dict, timeout: int = 60) -> dict:
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(url, data=data, headers=headers, method="POST")
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+    return post_json(url, payload, headers, timeout=timeout)
 
 
 def _sanitize_error(error: Exception) -> str:
     """Remove sensitive info from error message."""
     msg = str(error)
     # Remove potential API keys (patterns like sk-...)
-    import re
     msg = re.sub(r'sk-[a-zA-Z0-9_-]{20,}', '***API_KEY***', msg)
     return msg
 
 
-def translate_title_and_summary(
-    title: str,
-    description: str | None = None,
-    source: str | None = None,
-) -> tuple[str, str]:
-    """Translate title + description to Chinese (title + summary + bullets)."""
-
-    src = source or ""
-    desc = (description or "").strip()
+SYSTEM_PROMPT = """Output ONLY:
+标题：<Chinese title>
+摘要：<2-3 Chinese sentences>
+要点：
+- <bullet 1>
+- <bullet 2>
+- <bullet 3>"""
 
-    system = """Output ONLY:
+BATCH_SYSTEM_PROMPT = """For EACH numbered item, output ONLY a block in this format:
+===<item number>===
 标题：<Chinese title>
 摘要：<2-3 Chinese sentences>
 要点：
@@ -61,7 +62,132 @@ def translate_title_and_summary(
 - <bullet 2>
 - <bullet 3>"""
 
-    user_text = f"来源：{src}\n标题：{title}\n描述：{desc}"
+MAX_DESCRIPTION_CHARS = 400  # ~120 tokens; some pages ship multi-KB og:descriptions
+SENTENCE_END_RE = re.compile(r"[.!?。！？]")
+
+TITLE_RE = re.compile(r"^[ \t]*标题：[ \t]*(.*)$", re.M)
+SUMMARY_RE = re.compile(r"^[ \t]*摘要：(.*?)(?=^[ \t]*要点：|\Z)", re.M | re.S)
+POINTS_RE = re.compile(r"^[ \t]*要点：", re.M)
+BULLET_RE = re.compile(r"^[ \t]*- (.+)$", re.M)
+COMPLETE_BULLET_RE = re.compile(r"^[ \t]*- .+\n", re.M)
+
+BATCH_DELIMITER_RE = re.compile(r"^\s*===\s*(\d+)\s*===\s*$", re.M)
+
+
+def clip_description(description: str | None, limit: int = MAX_DESCRIPTION_CHARS) -> str:
+    """Trim description to at most limit chars, preferring a sentence boundary."""
+    desc = (description or "").strip()
+    if len(desc) <= limit:
+        return desc
+
+    clipped = desc[:limit]
+    ends = [m.end() for m in SENTENCE_END_RE.finditer(clipped)]
+    if ends and ends[-1] >= limit // 2:
+        return clipped[:ends[-1]]
+    return clipped[:-1].rstrip() + "…"
+
+
+def _has_all_bullets(text: str) -> bool:
+    """True once the 要点 section holds three fully received bullet lines."""
+    points = POINTS_RE.search(text)
+    return bool(points) and len(COMPLETE_BULLET_RE.findall(text, points.end())) >= 3
+
+
+def _single_complete(text: str) -> bool:
+    return bool(TITLE_RE.search(text)) and _has_all_bullets(text)
+
+
+def _batch_complete(count: int) -> Callable[[str], bool]:
+    def check(text: str) -> bool:
+        pieces = BATCH_DELIMITER_RE.split(text)
+        blocks = {int(num): block for num, block in zip(pieces[1::2], pieces[2::2])}
+        return all(n in blocks for n in range(1, count + 1)) and _has_all_bullets(blocks[count])
+    return check
+
+
+def _minimax_text(out: dict) -> str:
+    for block in out.get("content", []):
+        if block.get("type") == "text":
+            return block.get("text", "")
+    return ""
+
+
+def _minimax_delta(event: dict) -> str:
+    if event.get("type") == "error":
+        raise TranslationError(f"Stream error: {event.get('error')}")
+    delta = event.get("delta") or {}
+    if event.get("type") == "content_block_delta" and delta.get("type") == "text_delta":
+        return delta.get("text", "")
+    return ""
+
+
+def _openai_text(out: dict) -> str:
+    return out["choices"][0]["message"]["content"].strip()
+
+
+def _openai_delta(event: dict) -> str:
+    choices = event.get("choices") or [{}]
+    return (choices[0].get("delta") or {}).get("content") or ""
+
+
+def _stream_text(
+    url: str,
+    payload: dict,
+    headers: dict,
+    timeout: int,
+    delta_text: Callable[[dict], str],
+    is_complete: Callable[[str], bool],
+) -> str:
+    """Accumulate streamed text; stop reading once is_complete(text) holds."""
+    parts: list[str] = []
+    events = post_sse(url, {**payload, "stream": True}, headers, timeout=timeout)
+    try:
+        for event in events:
+            delta = delta_text(event)
+            if not delta:
+                continue
+            parts.append(delta)
+            # Sections end at line breaks; only re-check then
+            if "\n" in delta and is_complete("".join(parts)):
+                break
+    finally:
+        events.close()
+    return "".join(parts)
+
+
+def _request_text(
+    url: str,
+    payload: dict,
+    headers: dict,
+    timeout: int,
+    full_text: Callable[[dict], str],
+    delta_text: Callable[[dict], str],
+    is_complete: Callable[[str], bool] | None,
+) -> str:
+    """Return the reply text, streaming (with early stop) unless LLM_STREAM=0.
+
+    Errors during streaming (HTTP status, stream error events) propagate;
+    only a stream that yields no text, i.e. an endpoint that ignores
+    "stream", falls back to a regular request.
+    """
+    if is_complete is not None and os.environ.get("LLM_STREAM", "1") != "0":
+        text = _stream_text(url, payload, headers, timeout, delta_text, is_complete)
+        if text.strip():
+            return text.strip()
+    return full_text(_post_json(url, payload, headers, timeout=timeout))
+
+
+def _complete(
+    system: str,
+    user_text: str,
+    max_tokens: int = 1500,
+    is_complete: Callable[[str], bool] | None = None,
+) -> tuple[str, str]:
+    """Send one chat request. Returns (provider, response text).
+
+    With is_complete, the reply is streamed and the connection dropped as
+    soon as is_complete(text_so_far) is true, skipping the generation tail.
+    """
 
     # Try Minimax first
     minimax_key = os.environ.get("MINIMAX_API_KEY", "").strip()
@@ -73,7 +199,7 @@ def translate_title_and_summary(
 
         payload = {
             "model": model,
-            "max_tokens": 1500,
+            "max_tokens": max_tokens,
             "system": system,
             "messages": [
                 {"role": "user", "content": [{"type": "text", "text": user_text}]}
@@ -84,18 +210,14 @@ def translate_title_and_summary(
             "Authorization": f"Bearer {minimax_key}",
         }
         try:
-            out = _post_json(f"{base_url}/v1/messages", payload, headers, timeout=90)
-            content = out.get("content", [])
-            text_block = ""
-            for block in content:
-                if block.get("type") == "text":
-                    text_block = block.get("text", "")
-                    break
-
+            text_block = _request_text(
+                f"{base_url}/v1/messages", payload, headers, 90,
+                _minimax_text, _minimax_delta, is_complete,
+            )
             if not text_block:
                 raise TranslationError("No text block in response")
 
-            return _parse_response(text_block)
+            return "minimax", text_block
         except Exception as e:
             safe_msg = _sanitize_error(e)
             raise TranslationError(f"Minimax translation failed: {safe_msg}")
@@ -124,8 +246,32 @@ def translate_title_and_summary(
     }
 
     try:
-        out = _post_json(f"{base_url}/v1/chat/completions", payload, headers, timeout=60)
-        text = out["choices"][0]["message"]["content"].strip()
+        return "openai", _request_text(
+            f"{base_url}/v1/chat/completions", payload, headers, 60,
+            _openai_text, _openai_delta, is_complete,
+        )
+    except Exception as e:
+        safe_msg = _sanitize_error(e)
+        raise TranslationError(f"OpenAI translation failed: {safe_msg}")
+
+
+def translate_title_and_summary(
+    title: str,
+    description: str | None = None,
+    source: str | None = None,
+) -> tuple[str, str]:
+    """Translate title + description to Chinese (title + summary + bullets)."""
+
+    src = source or ""
+    desc = clip_description(description)
+
+    user_text = f"来源：{src}\n标题：{title}\n描述：{desc}"
+
+    provider, text = _complete(SYSTEM_PROMPT, user_text, is_complete=_single_complete)
+    if provider == "minimax":
+        return _parse_response(text)
+
+    try:
         parts = [p.strip() for p in text.split("\n\n") if p.strip()]
         zh_title = parts[0].splitlines()[0].strip()
         zh_summary = "\n\n".join(parts[1:]).strip() if len(parts) > 1 else ""
@@ -135,36 +281,101 @@ def translate_title_and_summary(
         raise TranslationError(f"OpenAI translation failed: {safe_msg}")
 
 
+def translate_batch(items: list[dict]) -> list[tuple[str, str] | None]:
+    """Translate several articles in one request.
+
+    Each item is a dict with "title" and optional "description" / "source".
+    Returns one (zh_title, zh_summary) per item, in order; None where the
+    model's reply had no usable block for that item.
+    """
+    if not items:
+        return []
+
+    entries = []
+    for n, item in enumerate(items, 1):
+        src = item.get("source") or ""
+        desc = clip_description(item.get("description"))
+        entries.append(f"{n}) 来源：{src}\n标题：{item.get('title', '')}\n描述：{desc}")
+    user_text = "\n\n".join(entries)
+
+    _, text = _complete(
+        BATCH_SYSTEM_PROMPT,
+        user_text,
+        max_tokens=max(1500, 700 * len(items)),
+        is_complete=_batch_complete(len(items)),
+    )
+
+    # re.split with one capture group yields [preamble, n1, block1, n2, block2, ...]
+    pieces = BATCH_DELIMITER_RE.split(text)
+    blocks = {}
+    for num, block in zip(pieces[1::2], pieces[2::2]):
+        blocks.setdefault(int(num), block)
+
+    results = []
+    for n in range(1, len(items) + 1):
+        block = blocks.get(n, "")
+        zh_title, zh_summary = _parse_response(block) if block.strip() else ("", "")
+        results.append((zh_title, zh_summary) if zh_title else None)
+    return results
+
+
+def translate_many(
+    items: list[dict],
+    batch_size: int = 8,
+    max_concurrency: int = 4,
+) -> list[tuple[str, str] | Exception | None]:
+    """Translate any number of items, issuing batch requests concurrently.
+
+    Items are split into chunks of batch_size and at most max_concurrency
+    requests are in flight at once. Like gather(return_exceptions=True), a
+    failed chunk does not abort the rest: each of its items gets the raised
+    exception instead of a result. None marks items missing from a reply.
+    """
+    if not items:
+        return []
+
+    batch_size = max(1, batch_size)
+    chunks = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+    def _run(chunk: list[dict]) -> list[tuple[str, str] | None]:
+        if len(chunk) == 1:
+            item = chunk[0]
+            return [translate_title_and_summary(
+                item.get("title", ""), item.get("description"), item.get("source")
+            )]
+        return translate_batch(chunk)
+
+    results: list[tuple[str, str] | Exception | None] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(chunks)))) as executor:
+        futures = [executor.submit(_run, chunk) for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                results.extend([e] * len(chunk))
+    return results
+
+
 def _parse_response(text: str) -> tuple[str, str]:
-    """Parse Minimax response format."""
-    lines = text.split("\n")
-    zh_title = ""
+    """Parse Minimax response format (标题/摘要/要点 sections)."""
+    title_match = TITLE_RE.search(text)
+    zh_title = title_match.group(1).strip() if title_match else ""
+
+    points_match = POINTS_RE.search(text)
+    bullets_text = text[points_match.end():] if points_match else ""
+    bullet_parts = [b.strip() for b in BULLET_RE.findall(bullets_text)]
+    bullet_parts += ["细节待补充"] * (3 - len(bullet_parts))
+
+    summary_match = SUMMARY_RE.search(text)
     summary_parts = []
-    bullet_parts = []
-    current_section = ""
-
-    for line in lines:
-        line = line.strip()
-        if line.startswith("标题："):
-            zh_title = line[3:].strip()
-        elif line.startswith("摘要："):
-            current_section = "summary"
-            summary_parts = [line[3:].strip()]
-        elif line.startswith("要点："):
-            current_section = "bullets"
-        elif line.startswith("- "):
-            if current_section == "bullets":
-                bullet_parts.append(line[2:].strip())
-            elif current_section == "summary":
-                summary_parts.append(line[2:].strip())
-        elif line and current_section == "summary":
-            summary_parts.append(line)
-
-    while len(bullet_parts) < 3:
-        bullet_parts.append("细节待补充")
-
-    zh_summary = "\n\n".join(summary_parts) if summary_parts else ""
-    if bullet_parts:
-        zh_summary = zh_summary + "\n\n要点：\n" + "\n".join(f"- {b}" for b in bullet_parts)
-
-    return zh_title, zh_summary
+    if summary_match:
+        for line in summary_match.group(1).splitlines():
+            line = line.strip()
+            if line.startswith("- "):
+                line = line[2:].strip()
+            if line:
+                summary_parts.append(line)
+
+    zh_summary = "\n\n".join(summary_parts)
+    bullets = "\n".join(f"- {b}" for b in bullet_parts)
+    return zh_title, f"{zh_summary}\n\n要点：\n{bullets}"
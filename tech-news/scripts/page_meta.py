@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""Extract <meta> values (og:description, og:image, ...) from article HTML.
+
+Uses selectolax when installed (C parser, fastest); otherwise falls back to
+the stdlib html.parser, which stops as soon as </head> is reached.
+
+fetch_page_meta() caches results per URL in cache/page_meta.json for
+CACHE_TTL seconds so re-runs don't re-download the same articles. New
+entries are kept in memory until flush(), which callers run once after a
+batch of fetches.
+
+Optional:
+  python3 -m pip install selectolax
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+
+from http_client import get_head
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as _FastHTMLParser
+except ImportError:
+    try:
+        # selectolax < 1.0 only ships the Modest backend
+        from selectolax.parser import HTMLParser as _FastHTMLParser
+    except ImportError:
+        _FastHTMLParser = None
+
+_FEED_CHUNK = 8192
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / "cache" / "page_meta.json"
+CACHE_TTL = 7 * 24 * 3600
+
+_cache_lock = threading.Lock()
+_cache: dict[str, dict] | None = None
+_pending: dict[str, dict] = {}
+
+
+class _MetaCollector(HTMLParser):
+    """Collect <meta property|name=... content=...> until </head>."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.meta: dict[str, str] = {}
+        self.done = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag != "meta":
+            return
+        values = dict(attrs)
+        key = values.get("property") or values.get("name")
+        content = values.get("content")
+        if key and content:
+            # First occurrence wins, like a top-down regex search
+            self.meta.setdefault(key.strip().lower(), content.strip())
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "head":
+            self.done = True
+
+
+def _collect_meta(html: str) -> dict[str, str]:
+    parser = _MetaCollector()
+    for start in range(0, len(html), _FEED_CHUNK):
+        parser.feed(html[start:start + _FEED_CHUNK])
+        if parser.done:
+            break
+    return parser.meta
+
+
+def extract_meta(html: str, *props: str) -> str | None:
+    """Return the content of the first matching meta tag.
+
+    Each prop is tried in order and matches either property="..." or
+    name="..." (e.g. extract_meta(html, "og:image", "twitter:image")).
+    """
+    if not html:
+        return None
+
+    if _FastHTMLParser is not None:
+        tree = _FastHTMLParser(html)
+        for prop in props:
+            for node in tree.css(f'meta[property="{prop}" i], meta[name="{prop}" i]'):
+                content = (node.attributes.get("content") or "").strip()
+                if content:
+                    return content
+        return None
+
+    meta = _collect_meta(html)
+    for prop in props:
+        content = meta.get(prop.lower())
+        if content:
+            return content
+    return None
+
+
+def _read_cache_file() -> dict[str, dict]:
+    try:
+        data = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_cache_file(cache: dict[str, dict]) -> None:
+    """Write atomically (temp file + rename) so a crash never leaves a torn file."""
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".page_meta-", suffix=".json", dir=CACHE_PATH.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, CACHE_PATH)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _is_fresh(entry: dict | None, now: float) -> bool:
+    return bool(entry) and now - entry.get("ts", 0) < CACHE_TTL
+
+
+def fetch_page_meta(url: str, timeout: float = 10) -> dict:
+    """Return {"og_desc", "og_image", "ts"} for an article page.
+
+    Served from the disk cache when fresh; otherwise fetches the page <head>
+    and keeps the result for the next flush(). Network errors propagate and
+    are not cached. og_image is returned as found in the page (may be relative).
+    """
+    global _cache
+    now = time.time()
+    with _cache_lock:
+        if _cache is None:
+            _cache = _read_cache_file()
+        entry = _cache.get(url)
+    if _is_fresh(entry, now):
+        return entry
+
+    html = get_head(url, timeout=timeout)
+    entry = {
+        "og_desc": extract_meta(html, "og:description", "description"),
+        "og_image": extract_meta(html, "og:image", "twitter:image"),
+        "ts": now,
+    }
+
+    with _cache_lock:
+        _cache[url] = entry
+        _pending[url] = entry
+    return entry
+
+
+def flush() -> None:
+    """Write entries fetched since the last flush to disk in one pass."""
+    global _cache
+    with _cache_lock:
+        if not _pending:
+            return
+        now = time.time()
+        # Merge with what other processes may have written since we loaded
+        merged = _read_cache_file()
+        merged.update(_pending)
+        merged = {k: v for k, v in merged.items() if _is_fresh(v, now)}
+        try:
+            _write_cache_file(merged)
+        except OSError:
+            return
+        _pending.clear()
+        _cache = merged
@@ -9,62 +9,125 @@ import os
 import re
 import sys
 import tempfile
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
 from pathlib import Path
 from urllib.parse import urljoin
 
+from http_client import env_workers, get
+from page_meta import extract_meta, fetch_page_meta, flush as flush_page_meta
+
 def extract_og_image(html, base_url):
     """Extract og:image or twitter:image from HTML"""
-    patterns = [
-        r'<meta[^>]*property=["\']og:image["\'][^>]*content=["\']([^"\']+)["\']',
-        r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*property=["\']og:image["\']',
-        r'<meta[^>]*name=["\']twitter:image["\'][^>]*content=["\']([^"\']+)["\']',
-        r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*name=["\']twitter:image["\']',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, html, re.IGNORECASE)
-        if match:
-            return urljoin(base_url, match.group(1))
-    
-    return None
+    image_url = extract_meta(html, "og:image", "twitter:image")
+    return urljoin(base_url, image_url) if image_url else None
 
 def download_image(url, temp_dir=None):
     """Download image to temporary file"""
-    req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-    
-    with urllib.request.urlopen(req, timeout=60) as resp:
-        data = resp.read()
-        content_type = resp.headers.get('Content-Type', '')
-        
-        # Determine extension
-        if 'webp' in content_type:
-            ext = '.webp'
-        elif 'png' in content_type:
-            ext = '.png'
-        elif 'gif' in content_type:
-            ext = '.gif'
-        else:
-            ext = '.jpg'
-        
-        # Save to temp file
-        import os
-        if temp_dir is None:
-            temp_dir = tempfile.gettempdir()
-        
-        temp_path = os.path.join(temp_dir, f"blog-image-{hash(url)}{ext}")
-        with open(temp_path, 'wb') as f:
-            f.write(data)
-        
-        return temp_path
+    data, resp_headers = get(url, timeout=60)
+    content_type = resp_headers.get('Content-Type', '')
+    
+    # Determine extension
+    if 'webp' in content_type:
+        ext = '.webp'
+    elif 'png' in content_type:
+        ext = '.png'
+    elif 'gif' in content_type:
+        ext = '.gif'
+    else:
+        ext = '.jpg'
+    
+    # Save to temp file
+    if temp_dir is None:
+        temp_dir = tempfile.gettempdir()
+    
+    # Unique name: uploads run concurrently and may share an image URL
+    fd, temp_path = tempfile.mkstemp(prefix="blog-image-", suffix=ext, dir=temp_dir)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    
+    return temp_path
+
+def fetch_article_image(article_url, timeout=30):
+    """Fetch an article page and return its og:image URL (or None)"""
+    image_url = fetch_page_meta(article_url, timeout=timeout)["og_image"]
+    return urljoin(article_url, image_url) if image_url else None
+
+def fetch_article_images(article_links, total_timeout=120):
+    """
+    Fetch og:image for all article pages concurrently
+    
+    Returns:
+        Dict of article_url -> image_url (None when missing or failed).
+        Pages still pending after total_timeout are treated as failed.
+    """
+    images = {url: None for url in article_links}
+    if not article_links:
+        return images
+    
+    executor = ThreadPoolExecutor(max_workers=env_workers("IMAGE_WORKERS", 8, len(article_links)))
+    future_map = {executor.submit(fetch_article_image, url): url for url in article_links}
+    try:
+        for future in as_completed(future_map, timeout=total_timeout):
+            article_url = future_map[future]
+            try:
+                images[article_url] = future.result()
+            except Exception as e:
+                print(f"  Error fetching {article_url[:60]}: {e}")
+    except FuturesTimeout:
+        print(f"  Timed out after {total_timeout}s, skipping remaining pages")
+    finally:
+        # shutdown(cancel_futures=True) needs Python 3.9+
+        for future in future_map:
+            future.cancel()
+        executor.shutdown(wait=False)
+        flush_page_meta()
+    
+    return images
+
+def _upload_image(image_url, key, r2_upload_func):
+    """Download image and upload via r2_upload_func, returning the public URL"""
+    temp_path = download_image(image_url)
+    try:
+        return r2_upload_func(temp_path, key=key, make_public=True)
+    finally:
+        os.unlink(temp_path)
 
-def process_post_images(post_path, r2_upload_func=None):
+# One article section: "### heading\n\n" followed by text (not crossing the
+# next heading) up to its [原文链接](url) line
+SECTION_PATTERN = re.compile(
+    r"(^### [^\n]+\n\n)((?:(?!^### ).)*?\[原文链接\]\(([^)]+)\))",
+    re.MULTILINE | re.DOTALL,
+)
+
+def insert_images(content, replacements):
+    """Insert img tags below each article heading in a single regex pass
+    
+    Args:
+        content: Markdown post content
+        replacements: Dict of article_url -> img tag
+    """
+    if not replacements:
+        return content
+    
+    pending = dict(replacements)
+    
+    def _insert(match):
+        img_tag = pending.pop(match.group(3), None)
+        if img_tag is None:
+            return match.group(0)
+        return f"{match.group(1)}{img_tag}\n\n{match.group(2)}"
+    
+    return SECTION_PATTERN.sub(_insert, content)
+
+def process_post_images(post_path, r2_upload_func=None, total_timeout=120):
     """
     Process all images for a blog post
     
     Args:
         post_path: Path to markdown file
         r2_upload_func: Upload function from r2-upload skill (optional)
+        total_timeout: Overall deadline in seconds for fetching article pages
     
     Returns:
         List of (article_url, image_url) tuples
@@ -75,59 +138,49 @@ def process_post_images(post_path, r2_upload_func=None):
     # Find article links
     article_links = re.findall(r'\[原文链接\]\(([^)]+)\)', content)
     
-    results = []
-    
-    for i, article_url in enumerate(article_links):
-        try:
-            print(f"Processing {i+1}/{len(article_links)}: {article_url[:60]}...")
-            
-            # Fetch article
-            req = urllib.request.Request(article_url, headers={"User-Agent": "Mozilla/5.0"})
-            with urllib.request.urlopen(req, timeout=30) as resp:
-                html = resp.read().decode("utf-8", errors="ignore")
-            
-            # Extract og:image
-            image_url = extract_og_image(html, article_url)
-            
-            if not image_url:
-                print(f"  No og:image found")
-                continue
-            
-            print(f"  Found image: {image_url[:60]}...")
-            
-            # Upload to R2 if function provided
-            if r2_upload_func:
-                # Generate key from post date
-                date_match = re.search(r'(\d{4})-(\d{2})-(\d{2})', post_path.name)
-                if date_match:
-                    year, month, day = date_match.groups()
-                    key = f"images/{year}/{month}/{day}/article-{i:02d}.jpg"
-                else:
-                    key = f"images/article-{i:02d}.jpg"
-                
-                # Download and upload
-                temp_path = download_image(image_url)
+    # Phase 1: fetch all article pages concurrently
+    print(f"Fetching og:image for {len(article_links)} articles...")
+    image_urls = fetch_article_images(article_links, total_timeout)
+    
+    found = [(i, url, image_urls[url]) for i, url in enumerate(article_links) if image_urls.get(url)]
+    for i, article_url, image_url in found:
+        print(f"  [{i+1}/{len(article_links)}] Found image: {image_url[:60]}...")
+    
+    if not r2_upload_func:
+        return [(article_url, image_url) for _, article_url, image_url in found]
+    
+    # Generate key prefix from post date
+    date_match = re.search(r'(\d{4})-(\d{2})-(\d{2})', post_path.name)
+    if date_match:
+        year, month, day = date_match.groups()
+        key_prefix = f"images/{year}/{month}/{day}/"
+    else:
+        key_prefix = "images/"
+    
+    # Phase 2: download and upload concurrently
+    uploaded = {}
+    if found:
+        with ThreadPoolExecutor(max_workers=env_workers("IMAGE_WORKERS", 8, len(found))) as executor:
+            future_map = {
+                executor.submit(_upload_image, image_url, f"{key_prefix}article-{i:02d}.jpg", r2_upload_func): (i, article_url)
+                for i, article_url, image_url in found
+            }
+            for future in as_completed(future_map):
+                i, article_url = future_map[future]
                 try:
-                    public_url = r2_upload_func(temp_path, key=key, make_public=True)
-                    print(f"  Uploaded: {public_url}")
-                    
-                    # Insert into content
-                    img_tag = f'<img src="{public_url}" alt="配图" style="max-width:100%;height:auto;margin:10px 0;">'
-                    
-                    # Find the section for this article and insert image
-                    pattern = rf"(### [^\n]+\n\n)(?=.*\[原文链接\]\({re.escape(article_url)}\))"
-                    if re.search(pattern, content, re.DOTALL):
-                        content = re.sub(pattern, rf"\1{img_tag}\n\n", content, count=1, flags=re.DOTALL)
-                    
-                    results.append((article_url, public_url))
-                finally:
-                    import os
-                    os.unlink(temp_path)
-            else:
-                results.append((article_url, image_url))
-        
-        except Exception as e:
-            print(f"  Error: {e}")
+                    uploaded[i] = (article_url, future.result())
+                    print(f"  Uploaded: {uploaded[i][1]}")
+                except Exception as e:
+                    print(f"  Error uploading {article_url[:60]}: {e}")
+    
+    results = [uploaded[i] for i in sorted(uploaded)]
+    
+    # Insert all images in one pass over the post
+    replacements = {
+        article_url: f'<img src="{public_url}" alt="配图" style="max-width:100%;height:auto;margin:10px 0;">'
+        for article_url, public_url in results
+    }
+    content = insert_images(content, replacements)
     
     # Save updated content
     post_path.write_text(content, encoding="utf-8")
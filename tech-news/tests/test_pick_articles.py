@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""pick_articles_balanced 的分类上限与补位测试。
+
+运行：python3 -m unittest discover -s tech-news/tests
+"""
+
+import sys
+import unittest
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from generate import CATEGORY_CAPS, pick_articles_balanced  # noqa: E402
+
+
+def _articles(titles, sources=("hackernews",)):
+    return [
+        {"title": title, "link": f"https://example.com/{i}", "source": sources[i % len(sources)]}
+        for i, title in enumerate(titles)
+    ]
+
+
+class PickArticlesBalancedTest(unittest.TestCase):
+    def test_single_category_pool_fills_limit(self):
+        pool = _articles([f"New LLM model {i}" for i in range(20)], sources=("hackernews", "lobsters"))
+        picked = pick_articles_balanced(pool, limit=10)
+        self.assertEqual(len(picked), 10)
+        self.assertEqual({a["category"] for a in picked}, {"AI 与机器学习"})
+
+    def test_limit_above_sum_of_caps(self):
+        titles = [f"{kw} {i}" for i in range(6) for kw in ("llm", "rust", "cloud", "design", "story")]
+        picked = pick_articles_balanced(_articles(titles), limit=20)
+        self.assertEqual(len(picked), 20)
+
+    def test_caps_prefer_other_categories(self):
+        titles = [f"llm agent {i}" for i in range(8)] + [f"rust compiler {i}" for i in range(4)]
+        picked = pick_articles_balanced(_articles(titles, sources=("hackernews", "lobsters")), limit=8)
+        counts = Counter(a["category"] for a in picked)
+        self.assertEqual(counts["AI 与机器学习"], CATEGORY_CAPS["AI 与机器学习"])
+        self.assertEqual(counts["开发工具与开源"], 4)
+
+    def test_small_pool_returns_everything(self):
+        pool = _articles([f"llm {i}" for i in range(3)])
+        self.assertEqual(len(pick_articles_balanced(pool, limit=10)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()